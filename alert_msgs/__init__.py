@@ -1,6 +1,13 @@
-from .alerts import PeriodicMsgs, PeriodicMsgSender, send_alert, MsgDst
+from .alerts import (
+    BufferedAlerts,
+    PeriodicMsgs,
+    PeriodicMsgSender,
+    send_alert,
+    send_alert_async,
+    MsgDst,
+)
 from .components import ContentType, FontSize, LineBreak, Map, Table, Text
 from .destinations import EmailAddrs, SlackChannel
-from .emails import send_email
-from .slack import send_slack_message
+from .emails import send_email, send_email_async
+from .slack import close_async_session, send_slack_message, send_slack_message_async
 from .utils import Emoji
@@ -1,15 +1,35 @@
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import reduce
+from operator import xor
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic, sleep
 from typing import Callable, Dict, List, Optional, Sequence, Union
 
-from .components import MsgComp
+from .components import (
+    LineBreak,
+    MsgComp,
+    Table,
+    _components_list,
+    render_components_html,
+    render_components_md,
+)
 from .destinations import EmailAddrs, SlackChannel
-from .emails import send_email
-from .slack import send_slack_message
+from .emails import send_email_async
+from .slack import close_async_session, send_slack_message_async
 from .utils import logger
 
 MsgDst = Union[EmailAddrs, SlackChannel]
 
+# destination config type -> async send function.
+_DST_SENDERS = {
+    SlackChannel: send_slack_message_async,
+    EmailAddrs: send_email_async,
+}
+
 
 @dataclass
 class PeriodicMsgs:
@@ -26,6 +46,14 @@ class PeriodicMsgs:
         if self.on_pub_func:
             self.on_pub_func()
 
+    async def publish_async(self, join_messages: bool = True):
+        if self.msg_buffer:
+            msg_buffer = [self.msg_buffer] if join_messages else self.msg_buffer
+            await send_alert_async(msg_buffer, self.send_to)
+            self.msg_buffer.clear()
+        if self.on_pub_func:
+            self.on_pub_func()
+
 
 class PeriodicMsgSender:
     """Buffer alerts and concatenate into one message."""
@@ -51,11 +79,145 @@ class PeriodicMsgSender:
     async def _on_func_pub_period(self, pub_freq: int):
         cfgs = self._periodic_msgs[pub_freq]
         for cfg in cfgs:
-            cfg.publish()
+            await cfg.publish_async()
         await asyncio.sleep(pub_freq)
         asyncio.create_task(self._on_func_pub_period(pub_freq))
 
 
+class BufferedAlerts:
+    """Buffer alerts in a background thread and send them in batches.
+
+    Alerts queued within `sleep_t` seconds of the first alert in a batch are concatenated into one message,
+    and batches are sent at least `sleep_t` seconds apart (when `max_batch_size` is reached, the batch waits).
+    """
+
+    _stop = object()
+
+    def __init__(
+        self,
+        send_to: Union[MsgDst, Sequence[MsgDst]],
+        sleep_t: float = 5.0,
+        max_batch_size: int = 50,
+        dedupe: bool = True,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            send_to (Union[MsgDst, Sequence[MsgDst]]): Where/how the messages should be sent.
+            sleep_t (float, optional): Seconds to wait for more alerts before sending a batch, and min seconds between sent batches. Defaults to 5.0.
+            max_batch_size (int, optional): Max number of alerts to concatenate into one message. Defaults to 50.
+            dedupe (bool, optional): Drop alerts with the same content as another alert in the batch. Defaults to True.
+            kwargs: Keyword arguments for `send_alert`.
+        """
+        self.send_to = send_to
+        self.sleep_t = sleep_t
+        self.max_batch_size = max_batch_size
+        self.dedupe = dedupe
+        self._send_kwargs = kwargs
+        self._queue = Queue()
+        self._closed = False
+        self._close_lock = Lock()
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def send_alert(self, content: Sequence[MsgComp]) -> None:
+        """Queue content to be sent with the next batch.
+
+        Args:
+            content (Sequence[MsgComp]): The content to include in the message.
+        """
+        if not content:
+            return
+        with self._close_lock:
+            if self._closed:
+                logger.warning(
+                    "Can not send alert, BufferedAlerts is closed: %s", content
+                )
+                return
+            self._queue.put(content)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Send all queued alerts and stop the background worker.
+
+        Args:
+            timeout (Optional[float], optional): Max seconds to wait for queued alerts to be sent. Defaults to None (wait indefinitely).
+        """
+        with self._close_lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(self._stop)
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _run(self):
+        stop = False
+        last_send_t = None
+        while not stop:
+            content = self._queue.get()
+            if content is self._stop:
+                return
+            batch = [content]
+            deadline = monotonic() + self.sleep_t
+            while len(batch) < self.max_batch_size:
+                try:
+                    content = self._queue.get(timeout=max(deadline - monotonic(), 0))
+                except Empty:
+                    break
+                if content is self._stop:
+                    stop = True
+                    break
+                batch.append(content)
+            # rate limit: at most one batch per `sleep_t` seconds.
+            if last_send_t is not None:
+                wait_t = last_send_t + self.sleep_t - monotonic()
+                if wait_t > 0:
+                    sleep(wait_t)
+            last_send_t = monotonic()
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: List[Sequence[MsgComp]]):
+        # errors must not escape to `_run`, or the worker dies and later alerts are never sent.
+        try:
+            components = []
+            # message hash -> messages in the batch with that hash.
+            batch_msgs: Dict[int, List[List[MsgComp]]] = defaultdict(list)
+            for content in batch:
+                content = _components_list(content)
+                if self.dedupe and self._is_duplicate(content, batch_msgs):
+                    logger.debug("Skipping duplicate buffered alert.")
+                    continue
+                if components:
+                    components.append(LineBreak(2))
+                components.extend(content)
+            send_alert(components, self.send_to, **self._send_kwargs)
+        except Exception as err:
+            logger.exception("Error sending %i buffered alerts: %s", len(batch), err)
+
+    @staticmethod
+    def _is_duplicate(
+        content: List[MsgComp], batch_msgs: Dict[int, List[List[MsgComp]]]
+    ) -> bool:
+        """Check if `content` is already in the batch, adding it to `batch_msgs` if not."""
+        try:
+            # XOR of the component digests, so it doesn't depend on component order.
+            msg_hash = reduce(xor, (c.fingerprint64() for c in content), 0)
+            for msg in batch_msgs[msg_hash]:
+                # compare contents in case of a hash collision.
+                if len(msg) == len(content) and all(
+                    a.fingerprint() == b.fingerprint() for a, b in zip(msg, content)
+                ):
+                    return True
+        except Exception:
+            return False
+        batch_msgs[msg_hash].append(content)
+        return False
+
+
 def send_alert(
     content: Sequence[MsgComp],
     send_to: Union[MsgDst, Sequence[MsgDst]],
@@ -63,6 +225,30 @@ def send_alert(
 ) -> bool:
     """Send a message via Slack and/or Email.
 
+    Args:
+        content (Sequence[MsgComp]): The content to include in the message.
+        send_to (Union[MsgDst, Sequence[MsgDst]]): Where/how the message should be sent.
+
+    Returns:
+        bool: Whether the message was sent successfully.
+    """
+    coro = _send_alert_in_new_loop(content, send_to, **kwargs)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # can't nest event loops, so run in a thread with its own loop.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+async def send_alert_async(
+    content: Sequence[MsgComp],
+    send_to: Union[MsgDst, Sequence[MsgDst]],
+    **kwargs,
+) -> bool:
+    """Send a message via Slack and/or Email, sending to all destinations concurrently.
+
     Args:
         content (Sequence[MsgComp]): The content to include in the message.
         send_to (Union[MsgDst, Sequence[MsgDst]]): Where/how the message should be sent.
@@ -72,18 +258,72 @@ def send_alert(
     """
     if not content:
         return False
+    if not isinstance(content, (list, tuple)):
+        content = [content]
     if not isinstance(send_to, (list, tuple)):
         send_to = [send_to]
-    sent_ok = []
+    dsts = []
     for st in send_to:
-        if isinstance(st, SlackChannel):
-            sent_ok.append(send_slack_message(content=content, send_to=st, **kwargs))
-        elif isinstance(st, EmailAddrs):
-            sent_ok.append(send_email(content=content, send_to=st, **kwargs))
-        else:
+        if (send := _dst_sender(st)) is None:
             logger.error(
                 "Unknown alert destination type (%s): %s. Valid choices: Email, Slack.",
                 type(st),
                 st,
             )
-    return all(sent_ok)
+        else:
+            dsts.append((send, st))
+    if not dsts:
+        return False
+    renders = await _render_content(
+        content, send_to, kwargs.get("use_premailer", False)
+    )
+    kwargs = {**renders, **kwargs}
+    sends = [send(content=content, send_to=st, **kwargs) for send, st in dsts]
+    return all(await asyncio.gather(*sends))
+
+
+async def _send_alert_in_new_loop(
+    content: Sequence[MsgComp],
+    send_to: Union[MsgDst, Sequence[MsgDst]],
+    **kwargs,
+) -> bool:
+    """Send an alert from a loop created just for it, closing the loop's HTTP session when done."""
+    try:
+        return await send_alert_async(content, send_to, **kwargs)
+    finally:
+        await close_async_session()
+
+
+def _dst_sender(send_to: MsgDst) -> Optional[Callable]:
+    """Get the async send function for a destination config (including subclasses of config types)."""
+    for cls in type(send_to).__mro__:
+        if (send := _DST_SENDERS.get(cls)) is not None:
+            return send
+
+
+async def _render_content(
+    content: Sequence[MsgComp], send_to: Sequence[MsgDst], use_premailer: bool = False
+) -> Dict[str, str]:
+    """Render the Markdown and/or HTML needed by the destinations once, concurrently and off the event loop.
+
+    Returns:
+        Dict[str, str]: Rendered content keyword arguments for the send functions (`body` for Slack, `html` for email).
+    """
+    # nested messages are rendered per message by the Slack sender.
+    if isinstance(content[0], (list, tuple)):
+        return {}
+    loop = asyncio.get_running_loop()
+    renders = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if any(isinstance(st, SlackChannel) for st in send_to):
+            renders["body"] = loop.run_in_executor(
+                executor, render_components_md, content, True
+            )
+        # email tables may be converted to attachments, which changes the HTML.
+        if any(isinstance(st, EmailAddrs) for st in send_to) and not any(
+            isinstance(c, Table) for c in content
+        ):
+            renders["html"] = loop.run_in_executor(
+                executor, render_components_html, content, use_premailer
+            )
+        return {k: await r for k, r in renders.items()}
@@ -1,25 +1,102 @@
 import csv
 import pickle
+import secrets
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from enum import Enum, auto
+from functools import cached_property, lru_cache
 from io import StringIO
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from dominate import document
 from dominate import tags as d
-from premailer import transform
-from prettytable import PrettyTable
-from xxhash import xxh32
+from dominate.util import raw
+from xxhash import xxh3_64, xxh3_64_intdigest, xxh3_128_intdigest
 
-from .utils import as_code_block
+from .utils import as_code_block, logger
+
+# Per-process salt for attachment file name hashes.
+_FILENAME_SALT = secrets.token_bytes(8)
+
+_BODY_CSS = "body {text-align:center;}"
+_TABLE_CSS = Path(__file__).parent.joinpath("styles", "table.css").read_text()
+_BODY_TABLE_CSS = f"{_BODY_CSS}\n{_TABLE_CSS}"
+
+
+# CSS properties -> equivalent legacy HTML attributes (which some email clients, e.g. Outlook, rely on).
+_LEGACY_ATTRS = {
+    "text-align": "align",
+    "vertical-align": "valign",
+    "background-color": "bgcolor",
+    "width": "width",
+}
+
+
+def _inline_attrs(css: str) -> Dict[str, Dict[str, str]]:
+    """Map each selector of a (simple) style sheet to the HTML attributes that apply it inline.
+
+    Each selector gets a `style` attribute plus the legacy attributes (`align`, `valign`, `bgcolor`, `width`)
+    that premailer would add. Properties set by multiple rules for the same selector take the value from the last rule.
+    """
+    rules = defaultdict(dict)
+    for rule in css.split("}"):
+        if "{" not in rule:
+            continue
+        selectors, declarations = rule.split("{", 1)
+        declarations = [decl.split(":", 1) for decl in declarations.split(";")]
+        for selector in selectors.split(","):
+            for prop, value in (decl for decl in declarations if len(decl) == 2):
+                rules[selector.strip()][prop.strip()] = value.strip()
+    attrs = {}
+    for selector, props in rules.items():
+        attrs[selector] = {
+            "style": "".join(f"{prop}:{value};" for prop, value in props.items())
+        }
+        for prop, attr in _LEGACY_ATTRS.items():
+            if prop in props:
+                value = props[prop]
+                # HTML width attributes are in pixels without a unit.
+                attrs[selector][attr] = value[:-2] if value.endswith("px") else value
+    return attrs
+
+
+_BODY_ATTRS = _inline_attrs(_BODY_CSS)["body"]
+_TABLE_ATTRS = _inline_attrs(_TABLE_CSS)
 
 
 # TODO List component.
 class MsgComp(ABC):
     """A structured component of a message."""
 
+    def fingerprint(self) -> int:
+        """Compute a digest of the component's current state.
+
+        Components of the same class with equal fingerprints render to identical output, so the digest can be used as a render cache key.
+        Raises whatever pickling the component's attributes raises if they can't be pickled.
+
+        Returns:
+            int: 128-bit xxh3 digest of the component class and attributes.
+        """
+        return xxh3_128_intdigest(self._pickled_state())
+
+    def fingerprint64(self) -> int:
+        """Compute a 64-bit digest of the component's current state.
+
+        Returns:
+            int: 64-bit xxh3 digest of the component class and attributes.
+        """
+        return xxh3_64_intdigest(self._pickled_state())
+
+    def _pickled_state(self) -> bytes:
+        cls = type(self)
+        return pickle.dumps((cls.__module__, cls.__qualname__, self._state()))
+
+    def _state(self) -> Dict[str, Any]:
+        """The attributes that determine how the component is rendered."""
+        return self.__dict__
+
     @abstractmethod
     def html(self) -> d.html_tag:
         """Render the component's content as a `dominate` HTML element.
@@ -96,6 +173,16 @@ def font_size_css(font_size: FontSize) -> str:
     return fonts.get(font_size, fonts[FontSize.MEDIUM])
 
 
+def _text_style(level: ContentType, font_size: FontSize) -> str:
+    return f"font-size:{font_size_css(font_size)};color:{level_css_color(level)};"
+
+
+# inline CSS for every (`ContentType`, `FontSize`) combination.
+_STYLE_CACHE = {
+    (lvl, fs): _text_style(lvl, fs) for lvl in ContentType for fs in FontSize
+}
+
+
 class Text(MsgComp):
     """A component that displays formatted text."""
 
@@ -124,10 +211,10 @@ class Text(MsgComp):
 
     def html(self) -> d.html_tag:
         tag = self._content_tags[self.level]
-        return tag(
-            self.value,
-            style=f"font-size:{font_size_css(self.font_size)};color:{level_css_color(self.level)};",
-        )
+        # fall back to building the style for values without a precomputed one (e.g. `font_size=None`).
+        if (style := _STYLE_CACHE.get((self.level, self.font_size))) is None:
+            style = _text_style(self.level, self.font_size)
+        return tag(self.value, style=style)
 
     def classic_md(self) -> str:
         if self.font_size is FontSize.SMALL:
@@ -158,18 +245,14 @@ class Map(MsgComp):
 
     def html(self) -> d.html_tag:
         kv_tag = d.span("\t") if self.inline else d.div
+        key_style = _STYLE_CACHE[(ContentType.IMPORTANT, FontSize.LARGE)]
+        value_style = _STYLE_CACHE[(ContentType.INFO, FontSize.LARGE)]
         with (container := d.div()):
             for k, v in self.data.items():
                 kv_tag(
                     d.span(
-                        d.b(
-                            Text(
-                                f"{k}: ",
-                                ContentType.IMPORTANT,
-                                FontSize.LARGE,
-                            ).html()
-                        ),
-                        Text(v, font_size=FontSize.LARGE).html(),
+                        d.b(d.h1(f"{k}: ", style=key_style)),
+                        d.div(str(v), style=value_style),
                     )
                 )
         return container
@@ -184,12 +267,15 @@ class Map(MsgComp):
 
     def slack_md(self) -> str:
         join_method = "\t" if self.inline else "\n"
-        return join_method.join([f"*{k}:* {v}" for k, v in self.data.items()])
+        return join_method.join(f"*{k}:* {v}" for k, v in self.data.items())
 
 
 class Table(MsgComp):
     """A component that displays tabular data."""
 
+    # attributes derived from the other attributes.
+    _derived_attrs = ("rows", "columns", "rows_tuples")
+
     def __init__(
         self,
         rows: Sequence[Dict[str, Any]],
@@ -202,95 +288,150 @@ class Table(MsgComp):
             title (Optional[str], optional): A title to display above the table body. Defaults to None.
             columns (Optional[Sequence[str]], optional): A list of column names. Defaults to None (will be inferred from body rows).
         """
-        self.rows = [{k: str(v) for k, v in row.items()} for row in rows]
-        self.title = (
-            Text(title, ContentType.IMPORTANT, FontSize.LARGE) if title else None
-        )
-        self.columns = (
-            list({c for row in self.rows for c in row.keys()})
-            if columns is None
-            else columns
-        )
+        # copy the inputs, so later changes to them can't make renders (and cached renders) stale.
+        # rows are only stringified if/when they are rendered.
+        self._raw_rows = [dict(row) for row in rows]
+        self._columns = None if columns is None else list(columns)
+        self.title = str(title) if title else None
         self._attachment: Map = None
 
+    @cached_property
+    def rows(self) -> Optional[List[Dict[str, str]]]:
+        """The table rows with all values converted to strings (None if rows have been attached as a file)."""
+        if self._raw_rows is None:
+            return None
+        _str = str
+        return [
+            {k: v if v.__class__ is _str else _str(v) for k, v in row.items()}
+            for row in self._raw_rows
+        ]
+
+    @cached_property
+    def columns(self) -> List[str]:
+        """The table column names."""
+        if self._columns is not None:
+            return self._columns
+        # ordered union of row keys.
+        columns = {}
+        for row in self._raw_rows or []:
+            columns.update(dict.fromkeys(row))
+        return list(columns)
+
+    @cached_property
+    def rows_tuples(self) -> Optional[List[Tuple[str, ...]]]:
+        """The (string) row values ordered by `columns`, with "" for missing columns (None if rows have been attached as a file)."""
+        if self.rows is None:
+            return None
+        return list(_row_values(self.rows, self.columns))
+
     def attach_rows_as_file(self) -> Tuple[str, StringIO]:
         """Create a CSV file containing the table rows.
 
         Returns:
             Tuple[str, StringIO]: Name of file and file object.
         """
-        stem = self.title.value[:50].replace(" ", "_") if self.title else "table"
-        rows_id = xxh32(pickle.dumps(self.rows)).hexdigest()
-        filename = f"{stem}_{rows_id}.csv"
+        stem = self.title[:50].replace(" ", "_") if self.title else "table"
         file = StringIO()
-        writer = csv.DictWriter(file, fieldnames=self.columns)
-        writer.writeheader()
-        writer.writerows(self.rows)
+        writer = csv.writer(file)
+        writer.writerow(self.columns)
+        # write the original values, there's no need to stringify them first.
+        writer.writerows(_row_values(self._raw_rows, self.columns))
         file.seek(0)
+        rows_id = xxh3_64(_FILENAME_SALT)
+        rows_id.update(file.getvalue().encode())
+        filename = f"{stem}_{rows_id.hexdigest()}.csv"
         self._attachment = Map({"Attachment": filename})
         # Don't render rows now that they're attached in a file.
+        self._raw_rows = None
         self.rows = None
+        self.rows_tuples = None
         return filename, file
 
+    def _state(self) -> Dict[str, Any]:
+        return {k: v for k, v in self.__dict__.items() if k not in self._derived_attrs}
+
     def html(self):
-        with (container := d.div(style="border:1px solid black;")):
-            if self.title:
-                self.title.html()
-            if self._attachment:
-                self._attachment.html()
-            if self.rows:
-                with d.div():
-                    with d.table():
-                        with d.tr():
-                            for column in self.columns:
-                                d.th(column)
-                        for row in self.rows:
-                            with d.tr():
-                                for column in self.columns:
-                                    d.td(row.get(column, ""))
+        container = d.div(style="border:1px solid black;")
+        if self.title:
+            container.add(
+                Text(self.title, ContentType.IMPORTANT, FontSize.LARGE).html()
+            )
+        if self._attachment:
+            container.add(self._attachment.html())
+        if self.rows:
+            th_attrs = _TABLE_ATTRS["th"]
+            td_attrs = _TABLE_ATTRS["td"]
+            # the header is the first row, so data row `i` is row number `i + 2`.
+            even_row_attrs = _TABLE_ATTRS["tr:nth-child(even)"]
+            table = container.add(d.div()).add(d.table(**_TABLE_ATTRS["table"]))
+            table.add(d.tr([d.th(column, **th_attrs) for column in self.columns]))
+            for i, row in enumerate(self.rows_tuples):
+                cells = [d.td(v, **td_attrs) for v in row]
+                table.add(d.tr(cells, **even_row_attrs) if i % 2 == 0 else d.tr(cells))
         return container
 
     def classic_md(self) -> str:
         data = []
         if self.title:
-            data.append(self.title.classic_md())
+            data.append(f"# {self.title}")
         if self._attachment:
             data.append(self._attachment.classic_md())
         if self.rows:
             table_rows = [
                 self.columns,
                 [":----:" for _ in range(len(self.columns))],
-            ] + [[row[col] for col in self.columns] for row in self.rows]
+            ] + self.rows_tuples
             data.append("\n".join(["|".join(row) for row in table_rows]))
         return "\n\n".join(data).strip()
 
-    def slack_md(self, float_format: str = ".3") -> str:
+    def slack_md(self) -> str:
         if not self.rows:
             return ""
-        columns = defaultdict(list)
-        for row in self.rows:
-            for k, v in row.items():
-                columns[k].append(v)
         # Slack can't render very many rows in a single table.
         max_rows = 15
-        table_slices = defaultdict(PrettyTable)
-        for column, values in columns.items():
-            for i in range(0, len(values), max_rows):
-                table = table_slices[i]
-                table.add_column(column, values[i : i + max_rows])
-        data = []
+        data = [
+            _format_grid(self.rows_tuples[i : i + max_rows], self.columns)
+            for i in range(0, len(self.rows_tuples), max_rows)
+        ]
         if self.title:
-            data.append(table_slices.pop(0).get_string(title=self.title.value))
-        for table in table_slices.values():
-            if float_format:
-                table.float_format = float_format
-            data.append(table.get_string())
+            data[0] = f"{self.title}\n{data[0]}"
         data = [as_code_block(d) for d in data]
         if self._attachment:
             data.append(self._attachment.slack_md())
         return "\n\n".join(data).strip()
 
 
+def _row_values(
+    rows: Sequence[Dict[str, Any]], columns: Sequence[str]
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield the values of each row, ordered by `columns` ("" for missing columns)."""
+    if len(columns) < 2:
+        # itemgetter needs at least one item and returns a scalar for one item.
+        for row in rows:
+            yield tuple(row.get(column, "") for column in columns)
+        return
+    get_values = itemgetter(*columns)
+    for row in rows:
+        try:
+            yield get_values(row)
+        except KeyError:
+            yield tuple(row.get(column, "") for column in columns)
+
+
+def _format_grid(rows: List[Tuple[str, ...]], columns: Sequence[str]) -> str:
+    """Format rows as a plain text grid with left-aligned, fixed width columns."""
+    widths = [
+        max(len(str(col)), max((len(row[i]) for row in rows), default=0))
+        for i, col in enumerate(columns)
+    ]
+    lines = [
+        " | ".join(str(col).ljust(w) for col, w in zip(columns, widths)),
+        "-+-".join("-" * w for w in widths),
+    ]
+    lines.extend(" | ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows)
+    return "\n".join(line.rstrip() for line in lines)
+
+
 class LineBreak(MsgComp):
     """A line beak (to be inserted between components)."""
 
@@ -298,46 +439,40 @@ class LineBreak(MsgComp):
         self.n_break = n_break
 
     def html(self) -> d.html_tag:
-        with (container := d.div()):
-            for _ in range(self.n_break):
-                d.br()
-        return container
+        return d.div(raw("<br>" * self.n_break))
 
     def classic_md(self) -> str:
-        return "".join(["\n" for _ in range(self.n_break)])
+        return "\n" * self.n_break
 
     def slack_md(self) -> str:
         return self.classic_md()
 
 
-def render_components_html(components: Sequence[MsgComp]) -> str:
+def render_components_html(
+    components: Sequence[MsgComp], use_premailer: bool = False
+) -> str:
     """Compile components into email-safe HTML.
 
+    Rendered HTML is cached by component fingerprints, so repeated alerts with identical content skip rendering.
+
     Args:
         components (Sequence[MsgComp]): The components to include in the HTML.
+        use_premailer (bool, optional): Include the style sheets and inline them with `premailer` (requires the `premailer` extra). Defaults to False (use the precomputed inline styles).
 
     Returns:
         str: The generated HTML.
     """
     components = _components_list(components)
-    doc = document()
-    with doc.head:
-        d.style("body {text-align:center;}")
-    # check size of tables to determine how best to process.
-    if any(isinstance(c, Table) for c in components):
-        with doc.head:
-            d.style(Path(__file__).parent.joinpath("styles", "table.css").read_text())
-    with doc:
-        for c in components:
-            d.div(c.html())
-            d.br()
-
-    return transform(doc.render())
+    if (key := _ComponentsKey.create(components, use_premailer)) is None:
+        return _compile_html(components, use_premailer)
+    return _cached_html(key)
 
 
 def render_components_md(components: Sequence[MsgComp], slack_format: bool) -> str:
     """Compile components to Markdown.
 
+    Rendered Markdown is cached by component fingerprints, so repeated alerts with identical content skip rendering.
+
     Args:
         components (Sequence[MsgComp]): The components to include in the Markdown.
         slack_format (bool): Render the components using Slack's subset of Markdown features.
@@ -346,6 +481,32 @@ def render_components_md(components: Sequence[MsgComp], slack_format: bool) -> s
         str: The generated Markdown.
     """
     components = _components_list(components)
+    if (key := _ComponentsKey.create(components, slack_format)) is None:
+        return _compile_md(components, slack_format)
+    return _cached_md(key)
+
+
+def _compile_html(components: List[MsgComp], use_premailer: bool) -> str:
+    doc = document()
+    # other components only use inline styles, so premailer is only useful for tables.
+    use_premailer = use_premailer and any(isinstance(c, Table) for c in components)
+    if use_premailer:
+        doc.head.add(d.style(_BODY_TABLE_CSS))
+    else:
+        for attr, value in _BODY_ATTRS.items():
+            doc.body[attr] = value
+    with doc:
+        for c in components:
+            d.div(c.html())
+            d.br()
+    if use_premailer:
+        from premailer import transform
+
+        return transform(doc.render())
+    return doc.render()
+
+
+def _compile_md(components: List[MsgComp], slack_format: bool) -> str:
     return "\n\n".join([c.md(slack_format) for c in components]).strip()
 
 
@@ -353,3 +514,49 @@ def _components_list(components: Sequence[MsgComp]) -> List[MsgComp]:
     if isinstance(components, (MsgComp, str)):
         components = [components]
     return [Text(comp) if isinstance(comp, str) else comp for comp in components]
+
+
+class _ComponentsKey:
+    """Hashable render cache key for a sequence of components.
+
+    Equality is based on the component fingerprints (plus any render options), not object identity.
+    """
+
+    __slots__ = ("key", "_components")
+
+    def __init__(self, components: List[MsgComp], *options: Any) -> None:
+        self.key = (tuple(c.fingerprint() for c in components), *options)
+        self._components = components
+
+    @classmethod
+    def create(
+        cls, components: List[MsgComp], *options: Any
+    ) -> Optional["_ComponentsKey"]:
+        """Create a key, or return None if a component's state can't be fingerprinted."""
+        try:
+            return cls(components, *options)
+        except Exception as err:
+            # pickling can raise anything an attribute's `__reduce__` raises, and a failed key must never break rendering.
+            logger.debug("Not caching render of unpicklable components: %r", err)
+            return None
+
+    def release(self) -> List[MsgComp]:
+        """Return the components and drop the reference, so cache entries don't keep them alive."""
+        components, self._components = self._components, None
+        return components
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _ComponentsKey) and self.key == other.key
+
+
+@lru_cache(maxsize=256)
+def _cached_html(key: _ComponentsKey) -> str:
+    return _compile_html(key.release(), use_premailer=key.key[-1])
+
+
+@lru_cache(maxsize=256)
+def _cached_md(key: _ComponentsKey) -> str:
+    return _compile_md(key.release(), slack_format=key.key[-1])
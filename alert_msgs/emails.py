@@ -1,3 +1,4 @@
+import asyncio
 import smtplib
 import ssl
 import sys
@@ -55,6 +56,8 @@ def send_email(
     send_to: EmailAddrs,
     subject: str = "Alert From alert-msgs",
     retries: int = 1,
+    html: Optional[str] = None,
+    use_premailer: bool = False,
     **_,
 ) -> bool:
     # TODO allow arbitrary attachment files.
@@ -65,6 +68,8 @@ def send_email(
         send_to (Optional[EmailAddrs]): How/where to send the message.
         subject (str, optional): Subject line. Defaults to "Alert From alert-msgs".
         retries (int, optional): Number of times to retry sending. Defaults to 1.
+        html (Optional[str], optional): Pre-rendered HTML of `content`. Defaults to None (render `content`).
+        use_premailer (bool, optional): Inline the message's style sheets with `premailer` (requires the `premailer` extra) when rendering `content`. Defaults to False (use the precomputed inline styles).
     Returns:
         bool: Whether the message was sent successfully or not.
     """
@@ -78,7 +83,7 @@ def send_email(
         else {}
     )
     # generate HTML from components.
-    body = render_components_html(content)
+    body = render_components_html(content, use_premailer) if html is None else html
     message = MIMEMultipart("mixed")
     message["From"] = send_to.sender_addr
     message["Subject"] = subject
@@ -94,12 +99,13 @@ def send_email(
             bool: Whether the message was sent successfully or not.
         """
 
+        msg = message
         if attachments:
-            message = deepcopy(message)
+            msg = deepcopy(message)
             for filename, file in attachments.items():
                 p = MIMEText(file.read(), _subtype="text/csv")
                 p.add_header("Content-Disposition", f"attachment; filename={filename}")
-                message.attach(p)
+                msg.attach(p)
         with smtplib.SMTP_SSL(
             host=send_to.smtp_server,
             port=send_to.smtp_port,
@@ -108,7 +114,7 @@ def send_email(
             for _ in range(retries + 1):
                 try:
                     smtp.login(send_to.sender_addr, send_to.password.get_secret_value())
-                    smtp.send_message(message)
+                    smtp.send_message(msg)
                     logger.info("Email sent successfully.")
                     return True
                 except smtplib.SMTPSenderRefused as err:
@@ -128,3 +134,38 @@ def send_email(
             subject += f" ({len(attachment_tables)} Failed Attachments)"
             sent_ok.append(try_send_message())
     return all(sent_ok)
+
+
+async def send_email_async(
+    content: Sequence[MsgComp],
+    send_to: EmailAddrs,
+    subject: str = "Alert From alert-msgs",
+    retries: int = 1,
+    html: Optional[str] = None,
+    use_premailer: bool = False,
+    **kwargs,
+) -> bool:
+    """Send an email without blocking the event loop.
+
+    The SMTP session runs in a worker thread, so it can overlap with other sends.
+
+    Args:
+        content (Sequence[MsgComp]): Components used to construct the message.
+        send_to (Optional[EmailAddrs]): How/where to send the message.
+        subject (str, optional): Subject line. Defaults to "Alert From alert-msgs".
+        retries (int, optional): Number of times to retry sending. Defaults to 1.
+        html (Optional[str], optional): Pre-rendered HTML of `content`. Defaults to None (render `content`).
+        use_premailer (bool, optional): Inline the message's style sheets with `premailer` (requires the `premailer` extra) when rendering `content`. Defaults to False (use the precomputed inline styles).
+    Returns:
+        bool: Whether the message was sent successfully or not.
+    """
+    return await asyncio.to_thread(
+        send_email,
+        content=content,
+        send_to=send_to,
+        subject=subject,
+        retries=retries,
+        html=html,
+        use_premailer=use_premailer,
+        **kwargs,
+    )
@@ -1,43 +1,200 @@
+import asyncio
+import random
+import time
 import zipfile
-from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from urllib.error import URLError
+from weakref import WeakKeyDictionary
 
+from aiohttp import ClientError, ClientSession, ClientTimeout
 from pydantic import SecretStr
 from slack_bolt import App
-from toolz import partition_all
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.web.async_slack_response import AsyncSlackResponse
+from xxhash import xxh3_64_intdigest
 
 from .components import MsgComp, render_components_md
 from .destinations import SlackChannel
 from .utils import logger
 
+# Seconds to wait before the first retry of a failed message post.
+_INITIAL_BACKOFF = 0.25
 
-@lru_cache
-def get_app(bot_token: SecretStr):
+# Clients keyed by bot token digest, so the tokens themselves aren't kept as cache keys.
+_APPS: Dict[int, App] = {}
+# Async clients (token digest -> client) and the HTTP session (connection pool) they share, per event loop.
+_ASYNC_CLIENTS = WeakKeyDictionary()
+_SESSIONS = WeakKeyDictionary()
+
+
+def get_app(bot_token: SecretStr) -> App:
     """Return the App instance."""
-    return App(token=bot_token.get_secret_value())
+    key = xxh3_64_intdigest(bot_token.get_secret_value().encode())
+    if (app := _APPS.get(key)) is None:
+        app = _APPS[key] = App(token=bot_token.get_secret_value())
+    return app
+
+
+def get_async_client(bot_token: SecretStr) -> AsyncWebClient:
+    """Return the AsyncWebClient instance for the running event loop.
+
+    Clients reuse the loop's HTTP session, so connections are kept alive between requests and retries.
+    """
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        session = _SESSIONS[loop] = ClientSession(timeout=ClientTimeout(total=30))
+        _ASYNC_CLIENTS[loop] = {}
+    clients = _ASYNC_CLIENTS[loop]
+    key = xxh3_64_intdigest(bot_token.get_secret_value().encode())
+    if (client := clients.get(key)) is None:
+        client = clients[key] = AsyncWebClient(
+            token=bot_token.get_secret_value(), session=session
+        )
+    return client
+
+
+async def close_async_session():
+    """Close the running event loop's shared HTTP session (if there is one)."""
+    loop = asyncio.get_running_loop()
+    _ASYNC_CLIENTS.pop(loop, None)
+    if (session := _SESSIONS.pop(loop, None)) is not None:
+        await session.close()
 
 
 def try_post_message(
     app: App, channel: str, text: str, mrkdwn: bool = True, retries: int = 1, **kwargs
 ):
-    """Post a message to a slack channel, with retries."""
+    """Post a message to a slack channel, with retries (using exponential backoff)."""
     if not text:
         return False
-    for _ in range(retries + 1):
-        resp = app.client.chat_postMessage(
-            channel=channel, text=text, mrkdwn=mrkdwn, **kwargs
-        )
-        if resp.status_code == 200:
-            logger.info("Slack alert sent successfully.")
-            return True
-        logger.error("[%i] %s %s", resp.status_code, resp.http_verb, channel)
+    backoff = _INITIAL_BACKOFF
+    for attempt in range(retries + 1):
+        try:
+            resp = app.client.chat_postMessage(
+                channel=channel, text=text, mrkdwn=mrkdwn, **kwargs
+            )
+        except SlackApiError as err:
+            resp = err.response
+        else:
+            if resp.status_code == 200:
+                logger.info("Slack alert sent successfully.")
+                return True
+        _log_failed_response(resp, channel)
+        if attempt < retries:
+            time.sleep(_retry_delay(resp, backoff))
+            backoff *= 2
+    logger.error("Failed to send Slack alert.")
+    return False
+
+
+async def try_post_message_async(
+    client: AsyncWebClient,
+    channel: str,
+    text: str,
+    mrkdwn: bool = True,
+    retries: int = 1,
+    **kwargs,
+):
+    """Post a message to a slack channel, with retries (using exponential backoff)."""
+    if not text:
+        return False
+    backoff = _INITIAL_BACKOFF
+    for attempt in range(retries + 1):
+        try:
+            resp = await client.chat_postMessage(
+                channel=channel, text=text, mrkdwn=mrkdwn, **kwargs
+            )
+        except SlackApiError as err:
+            resp = err.response
+        else:
+            if resp.status_code == 200:
+                logger.info("Slack alert sent successfully.")
+                return True
+        _log_failed_response(resp, channel)
+        if attempt < retries:
+            await asyncio.sleep(_retry_delay(resp, backoff))
+            backoff *= 2
     logger.error("Failed to send Slack alert.")
     return False
 
 
+def _log_failed_response(resp: Union[SlackResponse, AsyncSlackResponse], channel: str):
+    logger.error(
+        "[%i] %s %s: %s",
+        resp.status_code,
+        resp.http_verb,
+        channel,
+        resp.get("error"),
+    )
+
+
+def _retry_delay(
+    resp: Union[SlackResponse, AsyncSlackResponse], backoff: float
+) -> float:
+    """Seconds to wait before retrying a failed request.
+
+    Rate limited requests wait for Slack's `Retry-After`, other failures wait `backoff` plus up to 50% jitter.
+    """
+    if resp.status_code == 429:
+        retry_after = resp.headers.get("Retry-After") or resp.headers.get("retry-after")
+        if retry_after:
+            return float(retry_after)
+    return backoff + random.uniform(0, backoff * 0.5)
+
+
+def upload_file(app: App, channel: str, content: bytes, filename: str) -> Optional[str]:
+    """Upload a file to a slack channel, with retries.
+
+    Returns:
+        Optional[str]: ID of the uploaded file, or None if the upload failed.
+    """
+    for _ in range(3):
+        try:
+            resp = app.client.files_upload(
+                channels=channel,
+                file=content,
+                filename=filename,
+            )
+            return resp["file"]["id"]
+        except URLError:
+            pass
+    logger.warning(
+        "Failed to upload file `%s` to Slack channel %s.",
+        filename,
+        channel,
+    )
+
+
+async def upload_file_async(
+    client: AsyncWebClient, channel: str, content: bytes, filename: str
+) -> Optional[str]:
+    """Upload a file to a slack channel, with retries.
+
+    Returns:
+        Optional[str]: ID of the uploaded file, or None if the upload failed.
+    """
+    for _ in range(3):
+        try:
+            resp = await client.files_upload(
+                channels=channel,
+                file=content,
+                filename=filename,
+            )
+            return resp["file"]["id"]
+        except ClientError:
+            pass
+    logger.warning(
+        "Failed to upload file `%s` to Slack channel %s.",
+        filename,
+        channel,
+    )
+
+
 def send_slack_message(
     content: Union[Sequence[MsgComp], Sequence[Sequence[MsgComp]]],
     send_to: SlackChannel,
@@ -45,6 +202,7 @@ def send_slack_message(
     subject: Optional[str] = None,
     attachment_files: Optional[Sequence[Union[str, Path]]] = None,
     zip_attachment_files: bool = True,
+    body: Optional[str] = None,
     **_,
 ) -> bool:
     """Send a message to a Slack channel.
@@ -56,6 +214,7 @@ def send_slack_message(
         subject (Optional[str], optional): Large bold text to display at the top of the message. Defaults to None.
         attachment_files: Optional[Sequence[Union[str,Path]]]: Files to attach to the message. Defaults to None.
         zip_attachment_files (bool, optional): Whether to zip the attachment files. Defaults to True.
+        body (Optional[str], optional): Pre-rendered Slack Markdown of `content` (only used when `content` is a single message). Defaults to None (render `content`).
 
     Returns:
         bool: Whether the message was sent successfully or not.
@@ -64,61 +223,107 @@ def send_slack_message(
         content = [content]
     app = get_app(send_to.bot_token)
     file_ids = []
-    kwargs = {}
     if attachment_files:
+        for file, filename in _attachment_file_contents(
+            attachment_files, zip_attachment_files
+        ):
+            if file_id := upload_file(app, send_to.channel, file, filename):
+                file_ids.append(file_id)
+    return all(
+        [
+            try_post_message(app, send_to.channel, retries=retries, **post)
+            for post in _message_posts(content, subject, file_ids, body)
+        ]
+    )
 
-        def upload_file(content, filename):
-            # Upload the file to Slack
-            for _ in range(3):
-                try:
-                    file_id = app.client.files_upload(
-                        # channel=send_to.channel,
-                        channels=send_to.channel,
-                        file=content,
-                        filename=filename,
-                    )
-                    file_ids.append(file_id["file"]["id"])
-                    return
-                except URLError:
-                    pass
-            logger.warning(
-                "Failed to upload file `%s` to Slack channel %s.",
-                filename,
-                send_to.channel,
-            )
 
-        if not isinstance(attachment_files, (list, tuple)):
-            attachment_files = [attachment_files]
-        attachment_files = [Path(f) for f in attachment_files]
-        if zip_attachment_files:
-            zip_content = BytesIO()
-            with zipfile.ZipFile(zip_content, "w") as zf:
-                for file in attachment_files:
-                    zf.write(file)
-            zip_content.seek(0)
-            filename = (
-                attachment_files[0].name + ".zip"
-                if len(attachment_files) == 1
-                else "files.zip"
+async def send_slack_message_async(
+    content: Union[Sequence[MsgComp], Sequence[Sequence[MsgComp]]],
+    send_to: SlackChannel,
+    retries: int = 1,
+    subject: Optional[str] = None,
+    attachment_files: Optional[Sequence[Union[str, Path]]] = None,
+    zip_attachment_files: bool = True,
+    body: Optional[str] = None,
+    **_,
+) -> bool:
+    """Send a message to a Slack channel without blocking the event loop.
+
+    Args:
+        content (Union[Sequence[MsgComp], Sequence[Sequence[MsgComp]]]): A message or messages (each message should be Sequence[MsgComp])
+        send_to: Slack config.
+        retries (int, optional): Number of times to retry sending. Defaults to 1.
+        subject (Optional[str], optional): Large bold text to display at the top of the message. Defaults to None.
+        attachment_files: Optional[Sequence[Union[str,Path]]]: Files to attach to the message. Defaults to None.
+        zip_attachment_files (bool, optional): Whether to zip the attachment files. Defaults to True.
+        body (Optional[str], optional): Pre-rendered Slack Markdown of `content` (only used when `content` is a single message). Defaults to None (render `content`).
+
+    Returns:
+        bool: Whether the message was sent successfully or not.
+    """
+    if not isinstance(content, (list, tuple)):
+        content = [content]
+    client = get_async_client(send_to.bot_token)
+    file_ids = []
+    if attachment_files:
+        for file, filename in _attachment_file_contents(
+            attachment_files, zip_attachment_files
+        ):
+            if file_id := await upload_file_async(
+                client, send_to.channel, file, filename
+            ):
+                file_ids.append(file_id)
+    sent_ok = []
+    for post in _message_posts(content, subject, file_ids, body):
+        sent_ok.append(
+            await try_post_message_async(
+                client, send_to.channel, retries=retries, **post
             )
-            upload_file(zip_content.read(), filename)
-        else:
-            for file in attachment_files:
-                upload_file(file.read_bytes(), file.name)
-        if file_ids:
-            kwargs["files"] = file_ids
+        )
+    return all(sent_ok)
+
+
+def _attachment_file_contents(
+    attachment_files: Union[Sequence[Union[str, Path]], str, Path],
+    zip_attachment_files: bool,
+) -> List[Tuple[bytes, str]]:
+    """Read attachment files as (content, filename) pairs, optionally zipped into a single file."""
+    if not isinstance(attachment_files, (list, tuple)):
+        attachment_files = [attachment_files]
+    attachment_files = [Path(f) for f in attachment_files]
+    if not zip_attachment_files:
+        return [(file.read_bytes(), file.name) for file in attachment_files]
+    zip_content = BytesIO()
+    with zipfile.ZipFile(zip_content, "w") as zf:
+        for file in attachment_files:
+            zf.write(file)
+    zip_content.seek(0)
+    filename = (
+        attachment_files[0].name + ".zip" if len(attachment_files) == 1 else "files.zip"
+    )
+    return [(zip_content.read(), filename)]
+
+
+def _message_posts(
+    content: Union[Sequence[MsgComp], Sequence[Sequence[MsgComp]]],
+    subject: Optional[str],
+    file_ids: List[str],
+    body: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Build the `chat_postMessage` arguments needed to send a message or messages."""
     if not isinstance(content[0], (list, tuple)):
-        if not subject:
-            text = render_components_md(
+        if body is None:
+            body = render_components_md(
                 components=content,
                 slack_format=True,
             )
-            return try_post_message(
-                app, send_to.channel, text, retries=retries, **kwargs
-            )
-        content = [content]
-
-    messages = [render_components_md(msg, slack_format=True) for msg in content]
+        if not subject:
+            if file_ids:
+                return [{"text": body, "files": file_ids}]
+            return [{"text": body}]
+        messages = [body]
+    else:
+        messages = [render_components_md(msg, slack_format=True) for msg in content]
     blocks = [{"type": "divider"}]
     if subject:
         blocks.append(
@@ -131,10 +336,11 @@ def send_slack_message(
                 },
             }
         )
-    sent_ok = []
+    posts = []
     # Use batches to comply with Slack block limits.
-    for batch in partition_all(23, messages):
-        for message in batch:
+    max_messages = 23
+    for i in range(0, len(messages), max_messages):
+        for message in messages[i : i + max_messages]:
             blocks.append(
                 {
                     "type": "context",
@@ -147,15 +353,6 @@ def send_slack_message(
                 }
             )
             blocks.append({"type": "divider"})
-        app = get_app(send_to.bot_token)
-        sent_ok.append(
-            try_post_message(
-                app,
-                send_to.channel,
-                text=subject or "alert-msgs",
-                retries=retries,
-                blocks=blocks,
-            )
-        )
-        blocks.clear()
-    return all(sent_ok)
+        posts.append({"text": subject or "alert-msgs", "blocks": blocks})
+        blocks = []
+    return posts
@@ -0,0 +1,245 @@
+import asyncio
+from collections import defaultdict
+from time import monotonic
+
+import pytest
+
+import alert_msgs.alerts as alerts
+import alert_msgs.emails as emails
+from alert_msgs import (
+    BufferedAlerts,
+    EmailAddrs,
+    LineBreak,
+    Map,
+    SlackChannel,
+    Table,
+    Text,
+    send_alert,
+)
+from alert_msgs.components import render_components_html, render_components_md
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Capture (send time, components) of each `send_alert` call made by `BufferedAlerts`."""
+    sent = []
+    monkeypatch.setattr(
+        alerts,
+        "send_alert",
+        lambda content, *_, **__: sent.append((monotonic(), content)),
+    )
+    return sent
+
+
+def values(components):
+    return [c.value if isinstance(c, Text) else type(c) for c in components]
+
+
+def test_send_alert_dispatches_destination_subclasses(monkeypatch):
+    sent_to = []
+
+    async def send(content, send_to, **_):
+        sent_to.append(send_to)
+        return True
+
+    monkeypatch.setattr(alerts, "_DST_SENDERS", {SlackChannel: send})
+
+    class MyChannel(SlackChannel):
+        pass
+
+    dst = MyChannel(bot_token="xoxb-test", channel="test")
+    assert send_alert([Text("test")], dst)
+    assert sent_to == [dst]
+    assert not send_alert([Text("test")], "not-a-destination")
+
+
+@pytest.fixture
+def dst_kwargs(monkeypatch):
+    """Capture the keyword arguments `send_alert` passes to each destination's sender."""
+    dst_kwargs = []
+
+    async def send(content, send_to, **kwargs):
+        dst_kwargs.append((type(send_to), kwargs))
+        return True
+
+    monkeypatch.setattr(alerts, "_DST_SENDERS", {SlackChannel: send, EmailAddrs: send})
+    return dst_kwargs
+
+
+slack_dst = SlackChannel(bot_token="xoxb-test", channel="test")
+email_dst = EmailAddrs(sender_addr="a@test", password="pw", receiver_addr="b@test")
+
+
+def test_send_alert_renders_content_once(dst_kwargs, monkeypatch):
+    renders = []
+
+    def counted(render):
+        def wrapper(*args):
+            renders.append(render)
+            return render(*args)
+
+        return wrapper
+
+    for render in ("render_components_md", "render_components_html"):
+        monkeypatch.setattr(alerts, render, counted(getattr(alerts, render)))
+    content = [Text("a"), Map({"b": "c"})]
+    assert send_alert(content, [slack_dst, email_dst], subject="s")
+    assert len(renders) == 2
+    assert [dst for dst, _ in dst_kwargs] == [SlackChannel, EmailAddrs]
+    for _, kwargs in dst_kwargs:
+        assert kwargs == {
+            "body": render_components_md(content, True),
+            "html": render_components_html(content),
+            "subject": "s",
+        }
+
+
+def test_send_alert_render_content_skips(dst_kwargs):
+    # only the formats needed by the destinations are rendered.
+    assert send_alert([Text("a")], slack_dst)
+    assert send_alert([Text("a")], email_dst)
+    # tables may become email attachments, so the email sender renders them itself.
+    assert send_alert([Table(rows=[{"a": 1}])], [slack_dst, email_dst])
+    # nested messages are rendered per message.
+    assert send_alert([[Text("a")], [Text("b")]], [slack_dst, email_dst])
+    assert [sorted(kwargs) for _, kwargs in dst_kwargs] == [
+        ["body"],
+        ["html"],
+        ["body"],
+        ["body"],
+        [],
+        [],
+    ]
+
+
+def test_send_alert_sends_concurrently(monkeypatch):
+    started = []
+
+    async def send(content, send_to, **_):
+        started.append(send_to)
+        # each send only finishes once every send has started.
+        while len(started) < 2:
+            await asyncio.sleep(0.01)
+        return True
+
+    monkeypatch.setattr(alerts, "_DST_SENDERS", {SlackChannel: send, EmailAddrs: send})
+
+    sends = alerts.send_alert_async([Text("a")], [slack_dst, email_dst])
+    assert asyncio.run(asyncio.wait_for(sends, 5))
+    assert started == [slack_dst, email_dst]
+
+
+def test_send_alert_email_use_premailer(monkeypatch):
+    rendered, messages = [], []
+
+    def render(content, use_premailer=False):
+        rendered.append(use_premailer)
+        return "<html></html>"
+
+    class SMTP:
+        def __init__(self, **_):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_):
+            pass
+
+        def login(self, *_):
+            pass
+
+        def send_message(self, message):
+            messages.append(message)
+
+    monkeypatch.setattr(alerts, "render_components_html", render)
+    monkeypatch.setattr(emails, "render_components_html", render)
+    monkeypatch.setattr(emails.smtplib, "SMTP_SSL", SMTP)
+    assert send_alert([Text("test")], email_dst, use_premailer=True)
+    assert send_alert([Text("test")], email_dst)
+    assert rendered == [True, False]
+    assert len(messages) == 2
+
+
+def test_buffered_alerts_batching(sent):
+    with BufferedAlerts("dst", sleep_t=0.2, max_batch_size=2) as buffered:
+        for i in range(5):
+            buffered.send_alert([Text(str(i))])
+    assert [values(c) for _, c in sent] == [
+        ["0", LineBreak, "1"],
+        ["2", LineBreak, "3"],
+        ["4"],
+    ]
+    # full batches still have to wait for the rate limit.
+    send_times = [t for t, _ in sent]
+    assert all(b - a >= 0.19 for a, b in zip(send_times, send_times[1:]))
+
+
+def test_buffered_alerts_flush_on_close(sent):
+    buffered = BufferedAlerts("dst", sleep_t=60)
+    buffered.send_alert([Text("a")])
+    buffered.send_alert("b")
+    start = monotonic()
+    # the stop sentinel ends the batch window, so queued alerts are sent now.
+    buffered.close()
+    assert monotonic() - start < 5
+    assert not buffered._worker.is_alive()
+    assert [values(c) for _, c in sent] == [["a", LineBreak, "b"]]
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise ValueError("can't pickle")
+
+
+def test_buffered_alerts_survive_bad_alerts(sent, monkeypatch):
+    errors = []
+    monkeypatch.setattr(alerts.logger, "exception", lambda *args: errors.append(args))
+    with BufferedAlerts("dst", sleep_t=0.05, max_batch_size=1) as buffered:
+        # not a sequence of components.
+        buffered.send_alert(1)
+        buffered.send_alert([Map({"k": Unpicklable()})])
+        buffered.send_alert([Text("a")])
+    assert len(errors) == 1
+    assert [values(c) for _, c in sent] == [[Map], ["a"]]
+
+
+def test_buffered_alerts_send_after_close(sent, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(alerts.logger, "warning", lambda *args: warnings.append(args))
+    buffered = BufferedAlerts("dst", sleep_t=0)
+    buffered.close()
+    buffered.send_alert([Text("a")])
+    buffered.close()
+    assert not sent
+    assert len(warnings) == 1
+
+
+def test_is_duplicate():
+    batch_msgs = defaultdict(list)
+    is_duplicate = BufferedAlerts._is_duplicate
+    assert not is_duplicate([Text("a"), Text("b")], batch_msgs)
+    # same content (different objects).
+    assert is_duplicate([Text("a"), Text("b")], batch_msgs)
+    # same components in a different order have the same XOR hash.
+    assert not is_duplicate([Text("b"), Text("a")], batch_msgs)
+    # XOR hash collision: [a, a] and [b, b] both hash to 0.
+    assert not is_duplicate([Text("a"), Text("a")], batch_msgs)
+    assert not is_duplicate([Text("b"), Text("b")], batch_msgs)
+    assert is_duplicate([Text("b"), Text("b")], batch_msgs)
+    # components that can't be fingerprinted are never dropped.
+    unpicklable = Map({"func": lambda: None})
+    assert not is_duplicate([unpicklable], batch_msgs)
+    assert not is_duplicate([unpicklable], batch_msgs)
+
+
+def test_buffered_alerts_dedupe(sent):
+    with BufferedAlerts("dst", sleep_t=0.1) as buffered:
+        for content in ([Text("a")], "a", [Text("b")]):
+            buffered.send_alert(content)
+    assert [values(c) for _, c in sent] == [["a", LineBreak, "b"]]
+    sent.clear()
+    with BufferedAlerts("dst", sleep_t=0.1, dedupe=False) as buffered:
+        for content in ([Text("a")], "a"):
+            buffered.send_alert(content)
+    assert [values(c) for _, c in sent] == [["a", LineBreak, "a"]]
@@ -1,12 +1,16 @@
+import re
 from io import StringIO
 from typing import Dict
 from uuid import uuid4
 
 import pytest
+from dominate import tags as d
 
+import alert_msgs
 from alert_msgs.components import (
     ContentType,
     FontSize,
+    LineBreak,
     Map,
     Table,
     Text,
@@ -38,6 +42,13 @@ def test_map_render():
     assert text_has_content(o.slack_md())
 
 
+@pytest.mark.parametrize("n_break", [1, 3])
+def test_line_break_render(n_break):
+    o = LineBreak(n_break)
+    assert o.html().render().count("<br>") == n_break
+    assert o.classic_md() == o.slack_md() == "\n" * n_break
+
+
 @pytest.mark.parametrize("caption", [None, str(uuid4())])
 @pytest.mark.parametrize("meta", [None, str_dict])
 @pytest.mark.parametrize("attach_rows", [False, True])
@@ -74,12 +85,147 @@ def test_table_render(caption, meta, attach_rows):
         assert text_has_content(o.slack_md())
 
 
-def test_render_components_html(components):
-    html = render_components_html(components)
+@pytest.mark.parametrize("use_premailer", [False, True])
+def test_render_components_html(components, use_premailer):
+    html = render_components_html(components, use_premailer=use_premailer)
     assert isinstance(html, str)
+    if not use_premailer:
+        # styles should all be inline.
+        assert "<style>" not in html
+
+
+def test_render_components_html_premailer_only_for_tables():
+    components = [Text(str(uuid4())), Map(str_dict)]
+    assert render_components_html(
+        components, use_premailer=True
+    ) == render_components_html(components)
 
 
 @pytest.mark.parametrize("slack_format", [False, True])
 def test_render_components_md(components, slack_format):
     md = render_components_md(components, slack_format)
     assert isinstance(md, str)
+
+
+def test_text_render_default_font_size():
+    assert (
+        'style="font-size:18px;color:black;"'
+        in Text("x", font_size=None).html().render()
+    )
+
+
+def test_fingerprint():
+    assert Text("a").fingerprint() == Text("a").fingerprint()
+    assert Text("a").fingerprint() != Text("b").fingerprint()
+    assert Text("a").fingerprint() != Text("a", ContentType.ERROR).fingerprint()
+    assert Map({"a": "b"}).fingerprint() != Text("a").fingerprint()
+    assert Text("a").fingerprint64() == Text("a").fingerprint64()
+    assert Text("a").fingerprint64() != Text("b").fingerprint64()
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise ValueError("can't pickle")
+
+    def __str__(self):
+        return "unpicklable"
+
+
+def test_render_unpicklable_components():
+    components = [Map({"k": Unpicklable()})]
+    assert "unpicklable" in render_components_md(components, True)
+    assert "unpicklable" in render_components_md(components, False)
+    assert "unpicklable" in render_components_html(components)
+
+
+def test_fingerprint_includes_component_class():
+    class Text(alert_msgs.Text):
+        def html(self):
+            return d.b(self.value)
+
+    assert Text("a").fingerprint() != alert_msgs.Text("a").fingerprint()
+    assert "<b>a</b>" in render_components_html([Text("a")])
+    assert "<b>a</b>" not in render_components_html([alert_msgs.Text("a")])
+
+
+def test_render_cache_tracks_component_state():
+    rows = [{k: v * i for k, v in str_dict.items()} for i in range(1, 3)]
+    table = Table(rows=rows)
+    md = render_components_md([table], slack_format=False)
+    assert md == render_components_md([Table(rows=rows)], slack_format=False)
+    assert md != render_components_md([table], slack_format=True)
+    table.attach_rows_as_file()
+    assert render_components_md([table], slack_format=False) != md
+
+
+def test_table_columns_inferred_in_order():
+    o = Table(rows=[{"b": 1, "a": "x"}, {"c": None, "a": "y"}])
+    assert o.columns == ["b", "a", "c"]
+    assert o.rows == [{"b": "1", "a": "x"}, {"c": "None", "a": "y"}]
+
+
+def test_table_slack_md_grid():
+    o = Table(rows=[{"a": 1, "bbb": "xyz"}, {"a": 22}], title="T")
+    assert o.slack_md() == "```\nT\na  | bbb\n---+----\n1  | xyz\n22 |\n```"
+
+
+def test_table_lazy_rows():
+    o = Table(rows=[{"a": 1, "b": None}])
+    fingerprint = o.fingerprint()
+    o.classic_md()
+    assert o.fingerprint() == fingerprint
+    o = Table(rows=[{"a": 1, "b": None}])
+    _, file = o.attach_rows_as_file()
+    assert "rows" not in o._state() and o.rows is None
+    assert file.read().splitlines() == ["a,b", "1,"]
+
+
+def test_attachment_filename_from_csv_content():
+    rows = [{k: v * i for k, v in str_dict.items()} for i in range(1, 3)]
+    filename, _ = Table(rows=rows, title="My Table").attach_rows_as_file()
+    assert filename.startswith("My_Table_") and filename.endswith(".csv")
+    assert Table(rows=rows, title="My Table").attach_rows_as_file()[0] == filename
+    assert Table(rows=rows[:1], title="My Table").attach_rows_as_file()[0] != filename
+
+
+def test_table_html_structure():
+    o = Table(rows=[{"a": 1, "b": 2}, {"a": 3}, {"b": 4}], title="T")
+    html = render_components_html([o])
+    assert html.count("<tr") == 4
+    assert html.count("<th") == 2
+    assert html.count("<td") == 6
+    assert html.count(">T</h1>") == 1
+
+
+def test_table_rows_tuples():
+    o = Table(rows=[{"a": 1, "b": 2}, {"b": 3}])
+    assert o.rows_tuples == [("1", "2"), ("", "3")]
+    assert o.classic_md().splitlines()[-1] == "|3"
+
+
+def test_table_input_changes_dont_affect_render_cache():
+    rows = [{"a": "1"}]
+    o = Table(rows=rows)
+    md = render_components_md([o], slack_format=False)
+    rows.append({"a": "2"})
+    assert render_components_md([o], slack_format=False) == md
+    assert (
+        render_components_md([Table(rows=[{"a": "1"}, {"a": "2"}])], False)
+        == "a\n:----:\n1\n2"
+    )
+
+
+def test_inline_styles_have_premailer_legacy_attrs():
+    def legacy_attrs(html):
+        return {
+            (tag, attr, value)
+            for tag, attrs in re.findall(r"<(body|table|th|td)\b([^>]*)>", html)
+            for attr, value in re.findall(
+                r'\b(align|valign|bgcolor|width)="([^"]*)"', attrs
+            )
+        }
+
+    components = [Table(rows=[{"a": 1, "b": 2}, {"a": 3}])]
+    premailer_attrs = legacy_attrs(render_components_html(components, True))
+    assert premailer_attrs
+    assert premailer_attrs <= legacy_attrs(render_components_html(components))
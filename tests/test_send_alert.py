@@ -1,8 +1,17 @@
+import asyncio
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
 import pytest
-from alert_msgs import EmailAddrs, SlackChannel, send_email, send_slack_message
+from alert_msgs import (
+    BufferedAlerts,
+    EmailAddrs,
+    SlackChannel,
+    send_alert_async,
+    send_email,
+    send_slack_message,
+    send_slack_message_async,
+)
 
 
 def slack_msg_dst(request):
@@ -19,6 +28,29 @@ def test_send_slack_message(components, request, nested_components):
     send_slack_message(content=components, send_to=slack_msg_dst(request))
 
 
+@pytest.mark.parametrize("nested_components", [False, True])
+def test_send_slack_message_async(components, request, nested_components):
+    if nested_components:
+        components = [components for _ in range(3)]
+    asyncio.run(
+        send_slack_message_async(content=components, send_to=slack_msg_dst(request))
+    )
+
+
+def test_send_alert_async(components, request):
+    asyncio.run(
+        send_alert_async(
+            components, send_to=[slack_msg_dst(request), slack_msg_dst(request)]
+        )
+    )
+
+
+def test_buffered_alerts(components, request):
+    with BufferedAlerts(slack_msg_dst(request), sleep_t=1) as alerts:
+        for _ in range(3):
+            alerts.send_alert(components)
+
+
 @pytest.mark.parametrize("zip_attachments", [False, True])
 @pytest.mark.parametrize("n_files", [1, 4])
 def test_message_attachment(components, request, zip_attachments, n_files):
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from pydantic import SecretStr
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+import alert_msgs.slack as slack
+from alert_msgs import close_async_session
+
+
+def slack_response(status_code: int, headers=None) -> SlackResponse:
+    return SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": status_code == 200, "error": None if status_code == 200 else "err"},
+        headers=headers or {},
+        status_code=status_code,
+    )
+
+
+@pytest.mark.parametrize("header", ["Retry-After", "retry-after"])
+def test_retry_delay_rate_limited(header):
+    assert slack._retry_delay(slack_response(429, {header: "7"}), 0.25) == 7
+
+
+@pytest.mark.parametrize("status_code", [429, 500])
+@pytest.mark.parametrize("backoff", [0.25, 2])
+def test_retry_delay_jitter(status_code, backoff):
+    delays = [
+        slack._retry_delay(slack_response(status_code), backoff) for _ in range(200)
+    ]
+    assert all(backoff <= d <= backoff * 1.5 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_try_post_message_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(slack.time, "sleep", sleeps.append)
+    monkeypatch.setattr(slack.random, "uniform", lambda a, b: 0)
+    responses = [slack_response(500), slack_response(429, {"Retry-After": "3"})]
+
+    def chat_postMessage(**_):
+        if responses:
+            raise SlackApiError("error", responses.pop(0))
+        return slack_response(200)
+
+    app = SimpleNamespace(client=SimpleNamespace(chat_postMessage=chat_postMessage))
+    assert slack.try_post_message(app, "test", "text", retries=2)
+    assert sleeps == [0.25, 3]
+    responses = [slack_response(500)] * 3
+    sleeps.clear()
+    assert not slack.try_post_message(app, "test", "text", retries=2)
+    assert sleeps == [0.25, 0.5]
+
+
+def test_async_clients_share_loop_session():
+    async def clients():
+        a = slack.get_async_client(SecretStr("xoxb-a"))
+        b = slack.get_async_client(SecretStr("xoxb-b"))
+        assert a is slack.get_async_client(SecretStr("xoxb-a"))
+        assert a is not b and a.session is b.session
+        session = a.session
+        await close_async_session()
+        assert session.closed
+        return session
+
+    # each event loop gets its own session.
+    assert asyncio.run(clients()) is not asyncio.run(clients())
+
+
+def test_clients_cached_by_token_digest(monkeypatch):
+    monkeypatch.setattr(slack, "_APPS", {})
+    # App verifies the token with Slack's API when it's created.
+    monkeypatch.setattr(slack, "App", lambda token: SimpleNamespace(token=token))
+    a = slack.get_app(SecretStr("xoxb-a"))
+    assert a is slack.get_app(SecretStr("xoxb-a"))
+    assert a is not slack.get_app(SecretStr("xoxb-b"))
+    assert len(slack._APPS) == 2
+    # keys are token digests, not the tokens.
+    assert all(isinstance(k, int) for k in slack._APPS)
+
+    async def async_client_keys():
+        loop = asyncio.get_running_loop()
+        a = slack.get_async_client(SecretStr("xoxb-a"))
+        assert a is slack.get_async_client(SecretStr("xoxb-a"))
+        assert a is not slack.get_async_client(SecretStr("xoxb-b"))
+        keys = set(slack._ASYNC_CLIENTS[loop])
+        await close_async_session()
+        return keys
+
+    keys = asyncio.run(async_client_keys())
+    assert len(keys) == 2
+    assert all(isinstance(k, int) for k in keys)